@@ -8,14 +8,29 @@ class ModelUserFieldPermissionMixin(UserPassesTestMixin):
     def get_model_permission_user_field(self):
         return self.model_permission_user_field
 
+    def get_object(self, queryset=None):
+        # Reuse the object fetched by test_func(), rather than querying for it
+        # a second time once the view itself asks for it.
+        object = self.__dict__.get("_permission_object")
+        if queryset is None and object is not None:
+            return object
+        return super().get_object(queryset)
+
+    def _has_get_object(self):
+        return (
+            type(self).get_object is not ModelUserFieldPermissionMixin.get_object
+            or hasattr(super(), "get_object")
+        )
+
     def test_func(self):
         model_attr = self.get_model_permission_user_field()
         current_user = self.request.user
-        if getattr(self, "object", None):
-            object = self.object
-        elif hasattr(self, "get_object"):
-            object = self.get_object()
-        else:
-            object = self.get_queryset().first()
+        object = getattr(self, "object", None)
+        if object is None:
+            if self._has_get_object():
+                object = self.get_object()
+            else:
+                object = self.get_queryset().first()
+            self._permission_object = object
 
-        return current_user == getattr(object, model_attr)
+        return object is not None and current_user == getattr(object, model_attr)
@@ -1,12 +1,13 @@
 from django import template
-from django.template.loader import get_template
+
+from django_extensions.utils.templates import get_cached_template
 
 register = template.Library()
 
 
 @register.simple_tag
 def list_filter(view, spec):
-	tpl = get_template(spec.template)
+	tpl = get_cached_template(spec.template)
 	return tpl.render({
 		"request": view.request,
 		"title": spec.title,
@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+from functools import lru_cache
+
 from django import template
 from django.db.models import Model
 
@@ -34,9 +36,13 @@ def field_verbose_name(meta, field_name):
     
     <label>{{ object|field_verbose_name:'name' }}</label>
     """
-    if isinstance(meta, Model):
-        meta = meta._meta
-    return meta.get_field(field_name).verbose_name
+    model = type(meta) if isinstance(meta, Model) else meta.model
+    return _field_verbose_name(model, field_name)
+
+
+@lru_cache(maxsize=1024)
+def _field_verbose_name(model, field_name):
+    return model._meta.get_field(field_name).verbose_name
 
 
 @register.filter(name="hasattr")
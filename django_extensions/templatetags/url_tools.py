@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from django import template
+from django.http import QueryDict
 from django.utils.http import urlencode
 
 register = template.Library()
@@ -20,12 +21,12 @@ def build_query_string(request, **params):
         </a>
     {% endwith %}
     """
-    params = params or {}
-    p = request.GET.copy() if request else {}
+    if not params:
+        return urlencode(sorted(request.GET.lists()), doseq=True) if request else ""
+    p = request.GET.copy() if request else QueryDict(mutable=True)
     for k, v in params.items():
         if v is None:
-            if k in p:
-                del p[k]
+            p.pop(k, None)
         else:
-            p[k] = v
-    return "%s" % urlencode(sorted(p.items()))
+            p.setlist(k, [v])
+    return urlencode(sorted(p.lists()), doseq=True)
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from functools import lru_cache
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.template.loader import get_template
+from django.utils.autoreload import file_changed
+
+
+@lru_cache(maxsize=None)
+def get_cached_template(template_name):
+    """
+    Like get_template, except the compiled template is kept around so
+    repeated renders skip loader resolution altogether.
+    """
+    return get_template(template_name)
+
+
+@receiver(setting_changed, dispatch_uid="django_extensions_cached_template_settings")
+def clear_cached_templates_on_setting_change(*, setting, **kwargs):
+    if setting in {"TEMPLATES", "DEBUG", "INSTALLED_APPS"}:
+        get_cached_template.cache_clear()
+
+
+@receiver(file_changed, dispatch_uid="django_extensions_cached_template_file_changed")
+def clear_cached_templates_on_file_change(sender, file_path, **kwargs):
+    # mirror django.template.autoreload; never veto the reload ourselves
+    if file_path.suffix != ".py":
+        get_cached_template.cache_clear()
@@ -1,20 +1,16 @@
-import copy
 import inspect
 import itertools
+from functools import lru_cache, reduce
+from importlib import import_module
+from operator import or_
 
 from django import forms
 from django.contrib import messages
-from django.contrib.admin import FieldListFilter, helpers
-from django.contrib.admin.options import IS_FACETS_VAR, ModelAdmin, ShowFacets
-from django.contrib.admin.sites import AdminSite
-from django.contrib.admin.utils import get_fields_from_path, model_format_dict
-from django.contrib.admin.views.main import ChangeList
 from django.core.exceptions import ValidationError
 from django.db import models
-from django.db.models import Field
-from django.http import Http404
+from django.db.models import Case, Field, Q, Value, When
+from django.http import Http404, QueryDict
 from django.http.response import HttpResponseBase, HttpResponseRedirect
-from django.template.loader import get_template
 from django.utils.functional import cached_property
 from django.utils.inspect import method_has_no_args
 from django.utils.translation import gettext_lazy as _
@@ -22,6 +18,40 @@ from django.views.generic.detail import SingleObjectMixin
 from django.views.generic.list import MultipleObjectMixin
 
 from .. import settings
+from ..utils.templates import get_cached_template
+
+
+class _LazyAdminMethod:
+    """
+    Borrow a method from a django.contrib.admin class, importing it on
+    first access so that importing this module doesn't import the admin.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def __set_name__(self, owner, name):
+        self.owner = owner
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        module_path, class_name, method_name = self.path.rsplit(".", 2)
+        func = getattr(getattr(import_module(module_path), class_name), method_name)
+        # replace ourselves with the plain function for later lookups
+        setattr(self.owner, self.name, func)
+        return func.__get__(instance, owner)
+
+
+def _count(objects):
+    # QuerySet.count(), falling back to len() for lists and the like
+    count = getattr(objects, "count", None)
+    if (
+        callable(count)
+        and not inspect.isbuiltin(count)
+        and method_has_no_args(count)
+    ):
+        return count()
+    return len(objects)
 
 
 def action(
@@ -55,14 +85,14 @@ class SelectActionMixin(MultipleObjectMixin):
     model = None
     actions = None
     action_field = "pk"
-    action_form = helpers.ActionForm
+    action_form = None
     action_form_template = settings.SELECT_ACTION_TEMPLATE
     action_selection_max = None
     actions_selection_counter = True
 
     def setup(self, request, *args, **kwargs):
         super().setup(request, *args, **kwargs)
-        self.params = dict(request.GET.items())
+        self.params = request.GET
         self.filter_params = dict(request.GET.lists())
 
     def post(self, request, *args, **kwargs):
@@ -88,7 +118,17 @@ class SelectActionMixin(MultipleObjectMixin):
         # this page.
         if self.actions is None:
             return {}
-        actions = self._filter_actions_by_permissions(request, self._get_base_actions())
+        # Permissions don't change mid-request, so resolve the actions
+        # only once per request. A fresh dict is still built on every call,
+        # since overrides commonly delete entries from it.
+        cached = self.__dict__.get("_actions_cache")
+        if cached is not None and cached[0] is request:
+            actions = cached[1]
+        else:
+            actions = tuple(
+                self._filter_actions_by_permissions(request, self._get_base_actions())
+            )
+            self._actions_cache = (request, actions)
         return {name: (func, name, desc) for func, name, desc in actions}
 
     def get_action_choices(self, request, default_choices=models.BLANK_CHOICE_DASH):
@@ -96,18 +136,26 @@ class SelectActionMixin(MultipleObjectMixin):
         The same as the original implementation, except without
         presuming `opts` is a member of `self`.
         """
-        opts = self.model._meta
-        choices = [] + default_choices
-        for func, name, description in self.get_actions(request).values():
-            choice = (name, description % model_format_dict(opts))
-            choices.append(choice)
-        return choices
+        from django.contrib.admin.utils import model_format_dict
+
+        cached = self.__dict__.get("_action_choices_cache")
+        if cached is not None and cached[0] is request:
+            return default_choices + cached[1]
+        format_dict = model_format_dict(self.model._meta)
+        choices = [
+            (name, description % format_dict)
+            for func, name, description in self.get_actions(request).values()
+        ]
+        self._action_choices_cache = (request, choices)
+        return default_choices + choices
 
     def get_action(self, action):
         """
         Similar to ModelAdmin.get_action, except isn't reliant on
         having an `admin_site` member.
         """
+        from django.contrib.admin.options import ModelAdmin
+
         # If the action is a callable, just use it.
         if callable(action):
             func = action
@@ -126,6 +174,10 @@ class SelectActionMixin(MultipleObjectMixin):
         return func, action, description
 
     def get_action_form_class(self):
+        if self.action_form is None:
+            from django.contrib.admin.helpers import ActionForm
+
+            return ActionForm
         return self.action_form
 
     def get_action_form_kwargs(self):
@@ -152,24 +204,29 @@ class SelectActionMixin(MultipleObjectMixin):
         changelist; it returns an HttpResponse if the action was handled, and
         None otherwise.
         """
-        # Construct the action form.
-        data = request.POST.copy()
-        data.pop(helpers.ACTION_CHECKBOX_NAME, None)
-        data.pop("index", None)
+        from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+
+        # Construct the action form, leaving out the (potentially numerous)
+        # selected items rather than copying them only to pop them off.
+        data = QueryDict(mutable=True)
+        for key, values in request.POST.lists():
+            if key not in (ACTION_CHECKBOX_NAME, "index"):
+                data.setlist(key, values)
 
-        action_form = self.action_form(data, auto_id=None)
+        actions = self.get_actions(request)
+        action_form = self.get_action_form_class()(data, auto_id=None)
         action_form.fields["action"].choices = self.get_action_choices(request)
 
         # If the form's valid we can handle the action.
         if action_form.is_valid():
             action = action_form.cleaned_data["action"]
             select_across = action_form.cleaned_data["select_across"]
-            func = self.get_actions(request)[action][0]
+            func = actions[action][0]
 
             # Get the list of selected PKs. If nothing's selected, we can't
             # perform an action on it, so bail. Except we want to perform
             # the action explicitly on all objects.
-            selected = request.POST.getlist(helpers.ACTION_CHECKBOX_NAME)
+            selected = request.POST.getlist(ACTION_CHECKBOX_NAME)
             if not selected and not select_across:
                 # Reminder that something needs to be selected or nothing will happen
                 msg = _(
@@ -192,13 +249,14 @@ class SelectActionMixin(MultipleObjectMixin):
 
             # Perform the action
             if not select_across:
-            	lookup_kwarg = {f"{self.action_field}__in": selected}
+                lookup_kwarg = {f"{self.action_field}__in": selected}
                 queryset = queryset.filter(**lookup_kwarg)
             elif not self.can_select_across(request, func):
                 msg = _("This action requires a discrete selection of items.")
                 messages.error(request, msg)
                 return None
 
+            response = None
             try:
                 response = func(self, request, queryset)
             except ActionException as e:
@@ -207,7 +265,7 @@ class SelectActionMixin(MultipleObjectMixin):
             # Actions may return an HttpResponse-like object, which will be
             # used as the response from the POST. If not, we'll be a good
             # little HTTP citizen and redirect back to the changelist page.
-            if "response" in locals() and isinstance(response, HttpResponseBase):
+            if isinstance(response, HttpResponseBase):
                 return response
             return self.handle_action_finished(request)
         else:
@@ -222,48 +280,44 @@ class SelectActionMixin(MultipleObjectMixin):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        template = get_template(self.action_form_template)
-        results = (
-            context["page_obj"].object_list
-            if context.get("page_obj")
-            else self.object_list
-        )
+        template = get_cached_template(self.action_form_template)
+        page_obj = context.get("page_obj")
+        paginator = context.get("paginator")
+        results = page_obj.object_list if page_obj else self.object_list
         selection = self.get_selection(results)
-        total = (context["paginator"].object_list
-            if context.get("paginator")
-            else self.object_list)
+        # The current page gets rendered anyway, so fetch its rows once with
+        # len() rather than issuing a COUNT query, and reuse the paginator's
+        # count for the total.
+        result_count = len(results) if page_obj else _count(results)
+        total_count = paginator.count if paginator else result_count
         context["action_form"] = template.render(
             {
                 "model": self.model,
                 "form": self.get_action_form(),
                 "actions_selection_counter": self.actions_selection_counter,
                 "selection_list": selection,
-                "selection_count": (selection.count()
-                if hasattr(selection, "count")
-                and callable(selection.count)
-                and not inspect.isbuiltin(selection.count)
-                and method_has_no_args(selection.count)
-                else len(selection)),
+                "selection_count": _count(selection),
                 "result_list": results,
-                "result_count": (results.count()
-                if hasattr(results, "count")
-                and callable(results.count)
-                and not inspect.isbuiltin(results.count)
-                and method_has_no_args(results.count)
-                else len(results)),
-                "total_count": (self.object_list.count()
-                if hasattr(self.object_list, "count")
-                and callable(self.object_list.count)
-                and not inspect.isbuiltin(self.object_list.count)
-                and method_has_no_args(self.object_list.count)
-                else len(self.object_list)),
+                "result_count": result_count,
+                "total_count": total_count,
             }
         )
         context["action_form_url"] = self.get_action_form_url(self.request)
         return context
 
-    get_query_string = ChangeList.get_query_string
-    _filter_actions_by_permissions = ModelAdmin._filter_actions_by_permissions
+    get_query_string = _LazyAdminMethod(
+        "django.contrib.admin.views.main.ChangeList.get_query_string"
+    )
+    _filter_actions_by_permissions = _LazyAdminMethod(
+        "django.contrib.admin.options.ModelAdmin._filter_actions_by_permissions"
+    )
+
+
+@lru_cache(maxsize=None)
+def _default_modeladmin(modeladmin_class, model):
+    from django.contrib.admin.sites import AdminSite
+
+    return modeladmin_class(model, AdminSite())
 
 
 class ListFilterMixin(MultipleObjectMixin):
@@ -279,24 +333,27 @@ class ListFilterMixin(MultipleObjectMixin):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # copy list_filter so we don't modify the class variable
-        # when/if making dynamic changes within the instance
-        self.list_filter = copy.deepcopy(type(self).list_filter)
+        # when/if making dynamic changes within the instance; entries are
+        # strings, classes or (field, class) tuples, so a shallow copy will do
+        self.list_filter = list(type(self).list_filter or ())
 
     def setup(self, request, *args, **kwargs):
+        from django.contrib.admin.options import IS_FACETS_VAR, ModelAdmin, ShowFacets
+
         super().setup(request, *args, **kwargs)
-        self.params = dict(request.GET.items())
+        self.params = request.GET
         self.filter_params = dict(request.GET.lists())
         self.ignored_params = list(self.ignored_params or [])
         # add page param to ignored, since it is very unlikely we
         # desire it for filtration
         if self.page_kwarg not in self.ignored_params:
             self.ignored_params.append(self.page_kwarg)
-        # attach a model admin, since required for stock list filters
+        # attach a model admin, since required for stock list filters; the
+        # default one is shared by every request for this model, so it must
+        # be treated as read-only
         if not hasattr(self, "model_admin"):
-            self.model_admin = (
-                self.modeladmin_class(self.model, AdminSite())
-                if self.modeladmin_class
-                else ModelAdmin(self.model, AdminSite())
+            self.model_admin = _default_modeladmin(
+                self.modeladmin_class or ModelAdmin, self.model
             )
         if self.add_facets is None:
             self.add_facets = self.model_admin.show_facets is ShowFacets.ALWAYS or (
@@ -306,10 +363,12 @@ class ListFilterMixin(MultipleObjectMixin):
 
     @cached_property
     def has_active_filters(self):
-        expected_params = itertools.chain.from_iterable(
-            [filter.expected_parameters() for filter in self.get_filter_specs()]
+        params = self.get_filters_params()
+        return any(
+            param in params
+            for spec in self.get_filter_specs()
+            for param in spec.expected_parameters()
         )
-        return any(param in expected_params for param in self.get_filters_params())
 
     def get_filters_params(self, params=None):
         params = params or self.filter_params
@@ -322,6 +381,16 @@ class ListFilterMixin(MultipleObjectMixin):
         return lookup_params
 
     def get_filter_specs(self):
+        # Cache on the instance rather than with functools.cache, so the
+        # specs are released along with the view once the request is done.
+        if "_filter_specs" not in self.__dict__:
+            self._filter_specs = self._get_filter_specs()
+        return self._filter_specs
+
+    def _get_filter_specs(self):
+        from django.contrib.admin import FieldListFilter
+        from django.contrib.admin.utils import get_fields_from_path
+
         lookup_params = self.get_filters_params()
         filter_specs = []
         for list_filter in self.list_filter:
@@ -364,27 +433,83 @@ class ListFilterMixin(MultipleObjectMixin):
         return self.get_query_string(remove=filter_params)
 
     def get_queryset(self, *args, request=None, exclude_parameters=None, **kwargs):
+        from django.contrib.admin import FieldListFilter
+        from django.contrib.admin.options import IncorrectLookupParameters
+        from django.contrib.admin.utils import (
+            build_q_object_from_lookup_parameters,
+            lookup_spawns_duplicates,
+        )
+
         queryset = super().get_queryset(*args, **kwargs)
         request = request or self.request
-        filter_specs = self.get_filter_specs()
-        for filter_spec in filter_specs:
+        opts = queryset.model._meta
+        lookup_q = Q()
+        filter_specs = []
+        for filter_spec in self.get_filter_specs():
             if (
-                exclude_parameters is None
-                or filter_spec.expected_parameters() != exclude_parameters
+                exclude_parameters is not None
+                and filter_spec.expected_parameters() == exclude_parameters
             ):
-                new_qs = filter_spec.queryset(request, queryset)
-                if new_qs is not None:
-                    queryset = new_qs
+                continue
+            if type(filter_spec).queryset is FieldListFilter.queryset and not any(
+                lookup_spawns_duplicates(opts, param)
+                for param in filter_spec.used_parameters
+            ):
+                # Plain lookup filters are combined and applied with a single
+                # filter() call. Lookups spanning multi-valued relations are
+                # left alone, since chained filter() calls differ in meaning.
+                lookup_q &= build_q_object_from_lookup_parameters(
+                    filter_spec.used_parameters
+                )
+            else:
+                filter_specs.append(filter_spec)
+        if lookup_q:
+            try:
+                queryset = queryset.filter(lookup_q)
+            except (ValueError, ValidationError) as e:
+                # Fields may raise a ValueError or ValidationError when
+                # converting the parameters to the correct type.
+                raise IncorrectLookupParameters(e)
+        for filter_spec in filter_specs:
+            new_qs = filter_spec.queryset(request, queryset)
+            if new_qs is not None:
+                queryset = new_qs
         return queryset
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        template = get_template(self.list_filters_template)
+        template = get_cached_template(self.list_filters_template)
         context["list_filters"] = template.render({"view": self})
         context["has_active_filters"] = self.has_active_filters
         return context
 
-    get_query_string = ChangeList.get_query_string
+    get_query_string = _LazyAdminMethod(
+        "django.contrib.admin.views.main.ChangeList.get_query_string"
+    )
+
+
+@lru_cache(maxsize=None)
+def _build_pagination_form_class(
+    view_class, form_class, field_class, template_name, choices, initial
+):
+    return type(
+        f"{view_class.__name__}PaginationForm",
+        (form_class,),
+        {
+            "template_name": template_name,
+            "paginate_by": _build_pagination_field(field_class, choices, initial),
+        },
+    )
+
+
+def _build_pagination_field(field_class, choices, initial, **kwargs):
+    return field_class(
+        label=_("Paginate by"),
+        choices=choices,
+        initial=initial,
+        required=False,
+        **kwargs,
+    )
 
 
 class AdjustablePaginationMixin(MultipleObjectMixin):
@@ -396,24 +521,18 @@ class AdjustablePaginationMixin(MultipleObjectMixin):
 
     def setup(self, request, *args, **kwargs):
         super().setup(request, *args, **kwargs)
-        self.params = dict(request.GET.items())
+        self.params = request.GET
         self.filter_params = dict(request.GET.lists())
 
     def get_paginate_by(self, queryset=None):
         try:
             param = int(self.request.GET.get(self.pagination_param, 0))
-        except TypeError:
+        except (TypeError, ValueError):
             param = 0
-        choices = []
-        for i in self.pagination_choices:
-            choices.append((abs(i - param), i))
-        choice = sorted(choices, key=lambda x: x[0])[0][1]
-        return choice
+        return min(self.pagination_choices, key=lambda i: abs(i - param))
 
     def get_pagination_choices(self):
-        return sorted(
-            [(i, str(i)) for i in self.pagination_choices], key=lambda x: x[0]
-        )
+        return [(i, str(i)) for i in sorted(self.pagination_choices)]
 
     def get_pagination_field_class(self):
         return self.pagination_field_class
@@ -423,21 +542,33 @@ class AdjustablePaginationMixin(MultipleObjectMixin):
 
     def get_pagination_form(self):
         field_class = self.get_pagination_field_class()
-        form_class = type(
-            f"{type(self).__name__}PaginationForm",
-            (self.pagination_form,),
-            {
-                "template_name": self.pagination_form_template,
-                "paginate_by": field_class(
-                    label=_("Paginate by"),
-                    choices=self.get_pagination_choices(),
-                    initial=self.get_paginate_by(),
-                    required=False,
-                    **self.get_pagination_field_kwargs(),
-                ),
-            },
+        choices = tuple(self.get_pagination_choices())
+        initial = self.get_paginate_by()
+        args = (
+            type(self),
+            self.pagination_form,
+            field_class,
+            self.pagination_form_template,
+            choices,
+            initial,
         )
-        return form_class()
+        try:
+            hash(args)
+        except TypeError:
+            # e.g. grouped choices, so the class can't be cached
+            form_class = _build_pagination_form_class.__wrapped__(*args)
+        else:
+            form_class = _build_pagination_form_class(*args)
+        form = form_class()
+        # Field kwargs may hold per-request objects (such as widget
+        # instances), so they're applied to the form instance rather than
+        # becoming part of the cached class.
+        field_kwargs = self.get_pagination_field_kwargs()
+        if field_kwargs:
+            form.fields["paginate_by"] = _build_pagination_field(
+                field_class, choices, initial, **field_kwargs
+            )
+        return form
 
     def get_pagination_form_url(self, request):
         return request.path + self.get_query_string(remove=[self.pagination_param])
@@ -448,7 +579,9 @@ class AdjustablePaginationMixin(MultipleObjectMixin):
         context["pagination_form_url"] = self.get_pagination_form_url(self.request)
         return context
 
-    get_query_string = ChangeList.get_query_string
+    get_query_string = _LazyAdminMethod(
+        "django.contrib.admin.views.main.ChangeList.get_query_string"
+    )
 
 
 class MultipleLookupMixin(SingleObjectMixin):
@@ -456,17 +589,42 @@ class MultipleLookupMixin(SingleObjectMixin):
     lookup_url_kwarg = None
 
     def get_object(self, queryset=None):
-        if len(self.lookup_fields) == 0:
+        """
+        Look the object up by each of `lookup_fields` in a single query,
+        with earlier fields taking precedence over later ones. Unlike
+        QuerySet.get(), several objects matching the same field doesn't
+        raise MultipleObjectsReturned; the one with the lowest pk is
+        returned instead.
+        """
+        if not self.lookup_fields:
             raise AttributeError("'lookup_fields' cannot be empty")
         if not self.lookup_url_kwarg:
             raise AttributeError("'lookup_url_kwarg' must be specified")
-        queryset = queryset or self.get_queryset()
-        for i, field in enumerate(self.lookup_fields):
+        if queryset is None:
+            queryset = self.get_queryset()
+        lookup_value = self.kwargs.get(self.lookup_url_kwarg)
+        lookups = []
+        for field in self.lookup_fields:
+            lookup = Q(**{field: lookup_value})
             try:
-                return queryset.get(**{field: self.kwargs.get(self.lookup_url_kwarg)})
-            except (ValueError, ValidationError, queryset.model.DoesNotExist):
-                if i == (len(self.lookup_fields) - 1):
-                    raise Http404(
-                        _("No %(verbose_name)s found matching the query")
-                        % {"verbose_name": queryset.model._meta.verbose_name}
-                    )
+                # values incompatible with the field (e.g. a slug against an
+                # integer pk) are rejected as soon as the lookup is built
+                queryset.filter(lookup)
+            except (ValueError, ValidationError):
+                continue
+            lookups.append(lookup)
+        if lookups:
+            # match on any field in a single query, preferring fields in
+            # the order they're listed in `lookup_fields`
+            priority = Case(
+                *(When(lookup, then=Value(i)) for i, lookup in enumerate(lookups))
+            )
+            obj = (
+                queryset.filter(reduce(or_, lookups)).order_by(priority, "pk").first()
+            )
+            if obj is not None:
+                return obj
+        raise Http404(
+            _("No %(verbose_name)s found matching the query")
+            % {"verbose_name": queryset.model._meta.verbose_name}
+        )
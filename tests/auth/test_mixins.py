@@ -22,6 +22,14 @@ class OwnerView(ModelUserFieldPermissionMixin, EmptyResponseView):
     model_permission_user_field = 'owner'
 
 
+class OwnerDetailView(ModelUserFieldPermissionMixin, DetailView):
+    model = HasOwnerModel
+    model_permission_user_field = 'owner'
+
+    def render_to_response(self, context, **response_kwargs):
+        return HttpResponse(self.object.content)
+
+
 class ModelUserFieldPermissionMixinTests(TestCase):
     factory = RequestFactory()
     User = get_user_model()
@@ -35,13 +43,22 @@ class ModelUserFieldPermissionMixinTests(TestCase):
     def test_permission_pass(self):
         request = self.factory.get('/permission-required/' + str(self.ownerModel.id))
         request.user = self.user
-        resp = OwnerView.as_view()(request)
+        resp = OwnerView.as_view()(request, pk=self.ownerModel.pk)
         self.assertEqual(resp.status_code, 200)
 
     # # Test if non owner model is redirected
     def test_permission_denied_and_redirect(self):
         request = self.factory.get('/permission-required/' + str(self.ownerModel.id))
         request.user = AnonymousUser()
-        resp = OwnerView.as_view()(request)
+        resp = OwnerView.as_view()(request, pk=self.ownerModel.pk)
         self.assertRaises(PermissionDenied)
         self.assertEqual(resp.status_code, 302)
+
+    # Test if the object fetched for the permission check is reused by the view
+    def test_object_fetched_once(self):
+        request = self.factory.get('/permission-required/' + str(self.ownerModel.id))
+        request.user = self.user
+        # one query for the object and one for its owner
+        with self.assertNumQueries(2):
+            resp = OwnerDetailView.as_view()(request, pk=self.ownerModel.pk)
+        self.assertEqual(resp.status_code, 200)
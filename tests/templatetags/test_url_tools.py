@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase
+
+
+class BuildQueryStringTagTests(TestCase):
+    """Tests for build_query_string tag."""
+
+    def setUp(self):
+        self.request = RequestFactory().get('/', {'page': '2', 'tag': ['a', 'b']})
+
+    def test_should_keep_all_values_of_multi_value_params(self):
+        content = "{% load url_tools %}{% build_query_string request %}"
+
+        result = Template(content).render(Context({'request': self.request}))
+
+        self.assertEqual(result, 'page=2&amp;tag=a&amp;tag=b')
+
+    def test_should_override_and_remove_given_params(self):
+        content = "{% load url_tools %}{% build_query_string request page=None tag='c' %}"
+
+        result = Template(content).render(Context({'request': self.request}))
+
+        self.assertEqual(result, 'tag=c')
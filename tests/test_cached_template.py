@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+from django.utils.autoreload import file_changed
+
+from django_extensions.utils.templates import get_cached_template
+
+
+class GetCachedTemplateTests(SimpleTestCase):
+    def setUp(self):
+        get_cached_template.cache_clear()
+
+    def test_should_return_the_same_template_on_repeated_lookups(self):
+        template = get_cached_template('hello_world.html')
+
+        self.assertIs(get_cached_template('hello_world.html'), template)
+
+    def test_should_clear_cache_when_templates_setting_changes(self):
+        template = get_cached_template('hello_world.html')
+
+        with override_settings(TEMPLATES=[{'BACKEND': 'django.template.backends.django.DjangoTemplates', 'APP_DIRS': True}]):
+            self.assertEqual(get_cached_template.cache_info().currsize, 0)
+
+        self.assertIsNot(get_cached_template('hello_world.html'), template)
+
+    def test_should_clear_cache_when_a_template_file_changes(self):
+        get_cached_template('hello_world.html')
+
+        results = file_changed.send(sender=None, file_path=Path('/tmp/templates/hello_world.html'))
+
+        self.assertEqual(get_cached_template.cache_info().currsize, 0)
+        self.assertFalse(any(response for receiver, response in results if receiver.__module__ == 'django_extensions.utils.templates'))
+
+    def test_should_keep_cache_when_a_python_file_changes(self):
+        get_cached_template('hello_world.html')
+
+        file_changed.send(sender=None, file_path=Path('/tmp/module.py'))
+
+        self.assertEqual(get_cached_template.cache_info().currsize, 1)
@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+from unittest import mock
+
+from django import forms
+from django.contrib.admin import SimpleListFilter
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.db import SessionStore
+from django.db.models.query import QuerySet
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory, TestCase
+from django.views.generic import DetailView, ListView
+
+from django_extensions.views.mixins import (
+    AdjustablePaginationMixin,
+    ListFilterMixin,
+    MultipleLookupMixin,
+    SelectActionMixin,
+    _build_pagination_form_class,
+    action,
+)
+
+from tests.testapp.models import Club, Membership, Name, Person, SluggedTestModel
+
+
+class PaginatedClubView(AdjustablePaginationMixin, ListView):
+    model = Club
+
+
+class SelectWidgetClubView(PaginatedClubView):
+    def get_pagination_field_kwargs(self):
+        return {"widget": forms.Select(attrs={"class": "paginate"})}
+
+
+class AdjustablePaginationMixinTests(TestCase):
+    factory = RequestFactory()
+
+    def setUp(self):
+        _build_pagination_form_class.cache_clear()
+
+    def get_form(self, view_class, **params):
+        view = view_class()
+        view.setup(self.factory.get('/', params))
+        return view.get_pagination_form()
+
+    def test_should_pick_the_closest_pagination_choice(self):
+        form = self.get_form(PaginatedClubView, paginate_by='60')
+
+        self.assertEqual(form.fields['paginate_by'].initial, 50)
+
+    def test_should_fall_back_to_smallest_choice_for_invalid_values(self):
+        form = self.get_form(PaginatedClubView, paginate_by='abc')
+
+        self.assertEqual(form.fields['paginate_by'].initial, 25)
+
+    def test_should_reuse_form_class_across_requests(self):
+        first = self.get_form(PaginatedClubView, paginate_by='50')
+        second = self.get_form(PaginatedClubView, paginate_by='50')
+
+        self.assertIs(type(first), type(second))
+        self.assertEqual(_build_pagination_form_class.cache_info().currsize, 1)
+
+    def test_should_not_grow_cache_with_per_request_field_kwargs(self):
+        for _ in range(5):
+            form = self.get_form(SelectWidgetClubView)
+
+        self.assertEqual(_build_pagination_form_class.cache_info().currsize, 1)
+        self.assertEqual(form.fields['paginate_by'].widget.attrs, {'class': 'paginate'})
+        self.assertEqual(form.fields['paginate_by'].initial, 25)
+
+
+class AdultListFilter(SimpleListFilter):
+    title = 'adult'
+    parameter_name = 'adult'
+
+    def lookups(self, request, model_admin):
+        return [('yes', 'Yes')]
+
+    def queryset(self, request, queryset):
+        if self.value() == 'yes':
+            return queryset.filter(age__gte=18)
+
+
+class PersonListView(ListFilterMixin, ListView):
+    model = Person
+    list_filter = ['age', 'name', 'clubs', AdultListFilter]
+
+
+class ListFilterMixinTests(TestCase):
+    factory = RequestFactory()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ann = Name.objects.create(name='Ann')
+        cls.bob = Name.objects.create(name='Bob')
+        cls.chess = Club.objects.create(name='Chess')
+        cls.golf = Club.objects.create(name='Golf')
+        cls.ann_12 = Person.objects.create(name=cls.ann, age=12)
+        cls.ann_30 = Person.objects.create(name=cls.ann, age=30)
+        cls.bob_30 = Person.objects.create(name=cls.bob, age=30)
+        Membership.objects.create(person=cls.ann_12, club=cls.chess)
+        Membership.objects.create(person=cls.ann_30, club=cls.golf)
+        Membership.objects.create(person=cls.bob_30, club=cls.chess)
+
+    def get_view(self, **params):
+        view = PersonListView()
+        view.setup(self.factory.get('/', params))
+        return view
+
+    def get_spec(self, view, parameter):
+        for spec in view.get_filter_specs():
+            if parameter in spec.expected_parameters():
+                return spec
+
+    def test_should_combine_plain_filters_into_one_filter_call(self):
+        view = self.get_view(age='30', name__id__exact=str(self.ann.pk))
+        view.get_filter_specs()
+
+        with mock.patch.object(QuerySet, 'filter', autospec=True, side_effect=QuerySet.filter) as filter_mock:
+            queryset = view.get_queryset()
+
+        self.assertEqual(filter_mock.call_count, 1)
+        self.assertQuerySetEqual(queryset, [self.ann_30])
+
+    def test_should_apply_multi_valued_filters_on_their_own(self):
+        view = self.get_view(age='30', clubs__id__exact=str(self.chess.pk))
+        age_spec = self.get_spec(view, 'age')
+        clubs_spec = self.get_spec(view, 'clubs__id__exact')
+
+        with mock.patch.object(age_spec, 'queryset', wraps=age_spec.queryset) as age_queryset, \
+                mock.patch.object(clubs_spec, 'queryset', wraps=clubs_spec.queryset) as clubs_queryset:
+            queryset = view.get_queryset()
+
+        age_queryset.assert_not_called()
+        clubs_queryset.assert_called_once()
+        self.assertQuerySetEqual(queryset, [self.bob_30])
+
+    def test_should_call_custom_queryset_overrides(self):
+        view = self.get_view(adult='yes', name__id__exact=str(self.ann.pk))
+        adult_spec = self.get_spec(view, 'adult')
+
+        with mock.patch.object(adult_spec, 'queryset', wraps=adult_spec.queryset) as adult_queryset:
+            queryset = view.get_queryset()
+
+        adult_queryset.assert_called_once()
+        self.assertQuerySetEqual(queryset, [self.ann_30])
+
+    def test_should_raise_incorrect_lookup_parameters_for_invalid_values(self):
+        view = self.get_view(age='abc')
+
+        with self.assertRaises(IncorrectLookupParameters):
+            view.get_queryset()
+
+
+class SluggedDetailView(MultipleLookupMixin, DetailView):
+    model = SluggedTestModel
+    lookup_fields = ['pk', 'slug']
+    lookup_url_kwarg = 'key'
+
+
+class MultipleLookupMixinTests(TestCase):
+    factory = RequestFactory()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.first = SluggedTestModel.objects.create(title='first')
+        cls.numeric = SluggedTestModel.objects.create(title=str(cls.first.pk))
+
+    def get_object(self, key, view_class=SluggedDetailView):
+        view = view_class()
+        view.setup(self.factory.get('/'), key=key)
+        return view.get_object()
+
+    def test_should_find_object_by_pk(self):
+        self.assertEqual(self.get_object(str(self.numeric.pk)), self.numeric)
+
+    def test_should_find_object_by_slug(self):
+        self.assertEqual(self.get_object('first'), self.first)
+
+    def test_should_prefer_fields_listed_first(self):
+        class SlugFirstDetailView(SluggedDetailView):
+            lookup_fields = ['slug', 'pk']
+
+        key = str(self.first.pk)
+        self.assertEqual(self.numeric.slug, key)
+        self.assertEqual(self.get_object(key), self.first)
+        self.assertEqual(self.get_object(key, SlugFirstDetailView), self.numeric)
+
+    def test_should_skip_fields_incompatible_with_the_value(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_object('first'), self.first)
+
+    def test_should_raise_404_if_nothing_matches(self):
+        with self.assertRaises(Http404):
+            self.get_object('missing')
+        with self.assertRaises(Http404):
+            self.get_object('0')
+
+
+class ClubActionView(SelectActionMixin, ListView):
+    model = Club
+    ordering = ['pk']
+    actions = ['rename', 'close']
+
+    @action(description='Rename selected %(verbose_name_plural)s')
+    def rename(self, request, queryset):
+        self.acted_on = list(queryset)
+        return HttpResponse('renamed')
+
+    @action(description='Close selected %(verbose_name_plural)s')
+    def close(self, request, queryset):
+        self.acted_on = list(queryset)
+        return HttpResponse('closed')
+
+    def get_selection(self, queryset):
+        return queryset[:1]
+
+
+class PaginatedClubActionView(ClubActionView):
+    paginate_by = 2
+
+
+class RecordingActionForm(ActionForm):
+    def __init__(self, data=None, *args, **kwargs):
+        type(self).data_seen = data
+        super().__init__(data, *args, **kwargs)
+
+
+class SelectAcrossClubActionView(ClubActionView):
+    actions = ['rename', 'archive']
+    action_form = RecordingActionForm
+
+    @action(description='Archive %(verbose_name_plural)s', allow_select_across=True)
+    def archive(self, request, queryset):
+        self.acted_on = list(queryset)
+
+
+class RenameOnlyClubActionView(ClubActionView):
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        del actions['close']
+        return actions
+
+
+class SelectActionMixinTests(TestCase):
+    factory = RequestFactory()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.clubs = [Club.objects.create(name=name) for name in ('Chess', 'Golf', 'Polo')]
+
+    def get_view(self, view_class, method='get', data=None):
+        request = getattr(self.factory, method)('/', data or {})
+        request.session = SessionStore()
+        request._messages = FallbackStorage(request)
+        view = view_class()
+        view.setup(request)
+        return view
+
+    def test_should_return_a_fresh_actions_dict_on_every_call(self):
+        view = self.get_view(RenameOnlyClubActionView)
+
+        self.assertEqual(list(view.get_actions(view.request)), ['rename'])
+        self.assertEqual(list(view.get_actions(view.request)), ['rename'])
+
+    def test_should_dispatch_action_on_view_overriding_get_actions(self):
+        view = self.get_view(RenameOnlyClubActionView, 'post', {
+            'action': 'rename',
+            '_selected_action': [self.clubs[0].pk],
+        })
+
+        response = view.post(view.request)
+
+        self.assertEqual(response.content, b'renamed')
+        self.assertEqual(view.acted_on, [self.clubs[0]])
+
+    def test_should_run_action_on_selected_queryset(self):
+        view = self.get_view(ClubActionView, 'post', {
+            'action': 'close',
+            '_selected_action': [self.clubs[0].pk, self.clubs[2].pk],
+        })
+
+        response = view.post(view.request)
+
+        self.assertEqual(response.content, b'closed')
+        self.assertEqual(sorted(view.acted_on, key=lambda club: club.pk), [self.clubs[0], self.clubs[2]])
+
+    def test_should_not_run_action_without_selection(self):
+        view = self.get_view(ClubActionView, 'post', {'action': 'close'})
+
+        self.assertIsNone(view.response_action(view.request, Club.objects.all()))
+        self.assertFalse(hasattr(view, 'acted_on'))
+
+    def get_action_form_context(self, view_class, num_queries):
+        view = self.get_view(view_class)
+        view.object_list = view.get_queryset()
+        with mock.patch('django_extensions.views.mixins.get_cached_template') as get_template:
+            with self.assertNumQueries(num_queries):
+                view.get_context_data()
+        return get_template.return_value.render.call_args[0][0]
+
+    def test_should_count_results_of_current_page_and_total_from_paginator(self):
+        # one COUNT for the paginator and the page's rows, which the
+        # selection and result count are then taken from
+        context = self.get_action_form_context(PaginatedClubActionView, 2)
+
+        self.assertEqual(context['result_count'], 2)
+        self.assertEqual(context['total_count'], 3)
+        self.assertEqual(context['selection_count'], 1)
+
+    def test_should_count_results_once_without_pagination(self):
+        # one COUNT for the results, reused as the total, and the selection
+        context = self.get_action_form_context(ClubActionView, 2)
+
+        self.assertEqual(context['result_count'], 3)
+        self.assertEqual(context['total_count'], 3)
+        self.assertEqual(context['selection_count'], 1)
+
+    def test_should_build_action_form_data_without_selection_and_index(self):
+        view = self.get_view(SelectAcrossClubActionView, 'post', {
+            'action': 'archive',
+            'select_across': '1',
+            'index': '0',
+            '_selected_action': [club.pk for club in self.clubs],
+        })
+
+        response = view.post(view.request)
+
+        self.assertEqual(sorted(RecordingActionForm.data_seen), ['action', 'select_across'])
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(view.acted_on, self.clubs)
+
+    def test_should_reject_select_across_for_discrete_actions(self):
+        view = self.get_view(SelectAcrossClubActionView, 'post', {
+            'action': 'rename',
+            'select_across': '1',
+            '_selected_action': [self.clubs[0].pk],
+        })
+
+        self.assertIsNone(view.post(view.request))
+        self.assertFalse(hasattr(view, 'acted_on'))